@@ -3,8 +3,7 @@ Basic example of using the expman package with the log-based experiment model.
 """
 import time
 import random
-import pandas as pd
-from kepler import experiment, save_dataframe, save_dict
+from kepler import experiment, save_dict, save_records
 
 # Define experiment configuration
 config = {
@@ -46,8 +45,8 @@ with experiment("Basic Example", config=config, tags=["example", "demo"]) as exp
         print(f"Epoch {epoch+1}/{total_epochs}: accuracy={accuracy:.4f}, loss={loss:.4f}")
         
         # Log metrics in the experiment
-        exp.set_metric(f"accuracy_epoch_{epoch+1}", accuracy)
-        exp.set_metric(f"loss_epoch_{epoch+1}", loss)
+        exp.set_metric("accuracy", accuracy)
+        exp.set_metric("loss", loss)
         
         # Log resource usage (simulated)
         exp.log_resource("memory", f"{random.randint(200, 300)}MB")
@@ -56,23 +55,21 @@ with experiment("Basic Example", config=config, tags=["example", "demo"]) as exp
     # Log completion of training
     exp.log_info("Training completed successfully")
     
-    # Create a DataFrame from the results
-    results_df = pd.DataFrame(results)
-    
-    # Save the DataFrame
-    df_path = save_dataframe(results_df, "training_metrics", exp.id)
-    exp.log_info(f"Saved training metrics to {df_path}")
+    # Save the results table
+    table_path = save_records(results, "training_metrics", exp)
+    exp.log_info(f"Saved training metrics to {table_path}")
     
     # Save final metrics
+    best = max(results, key=lambda row: row["accuracy"])
     final_metrics = {
         "final_accuracy": results[-1]["accuracy"],
         "final_loss": results[-1]["loss"],
-        "best_accuracy": max(r["accuracy"] for r in results),
-        "best_epoch": max(range(len(results)), key=lambda i: results[i]["accuracy"]) + 1,
+        "best_accuracy": best["accuracy"],
+        "best_epoch": best["epoch"],
     }
     
     # Save the final metrics
-    metrics_path = save_dict(final_metrics, "final_metrics", exp.id)
+    metrics_path = save_dict(final_metrics, "final_metrics", exp)
     exp.log_info(f"Saved final metrics to {metrics_path}")
     
     # Set the final metrics in the experiment
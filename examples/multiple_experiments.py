@@ -1,11 +1,12 @@
 """
 Example of running multiple experiments with different configurations.
 """
+import os
 import time
 import random
 import itertools
-import pandas as pd
-from kepler import experiment, save_dataframe, save_dict
+from concurrent.futures import ProcessPoolExecutor
+from kepler import experiment, save_dict, save_records
 
 # Define parameter grid
 learning_rates = [0.001, 0.01, 0.1]
@@ -15,8 +16,11 @@ optimizers = ["adam", "sgd"]
 # Generate all combinations of parameters
 param_grid = list(itertools.product(learning_rates, batch_sizes, optimizers))
 
-# Run experiments for each parameter combination
-for lr, bs, opt in param_grid:
+
+def run_one(params):
+    """Run the experiment for a single parameter combination."""
+    lr, bs, opt = params
+
     # Define experiment configuration
     config = {
         "learning_rate": lr,
@@ -64,25 +68,23 @@ for lr, bs, opt in param_grid:
             print(f"Epoch {epoch+1}/{config['epochs']}: accuracy={accuracy:.4f}, loss={loss:.4f}")
             
             # Set metrics in the experiment
-            exp.set_metric(f"accuracy_epoch_{epoch+1}", accuracy)
-            exp.set_metric(f"loss_epoch_{epoch+1}", loss)
-        
-        # Create a DataFrame from the results
-        results_df = pd.DataFrame(results)
+            exp.set_metric("accuracy", accuracy)
+            exp.set_metric("loss", loss)
         
-        # Save the DataFrame
-        save_dataframe(results_df, "training_metrics", exp.id)
+        # Save the results table
+        save_records(results, "training_metrics", exp)
         
         # Save final metrics
+        best = max(results, key=lambda row: row["accuracy"])
         final_metrics = {
             "final_accuracy": results[-1]["accuracy"],
             "final_loss": results[-1]["loss"],
-            "best_accuracy": max(r["accuracy"] for r in results),
-            "best_epoch": max(range(len(results)), key=lambda i: results[i]["accuracy"]) + 1,
+            "best_accuracy": best["accuracy"],
+            "best_epoch": best["epoch"],
         }
         
         # Save the final metrics
-        save_dict(final_metrics, "final_metrics", exp.id)
+        save_dict(final_metrics, "final_metrics", exp)
         
         # Set the final metrics in the experiment
         for key, value in final_metrics.items():
@@ -92,7 +94,14 @@ for lr, bs, opt in param_grid:
         print(f"Best accuracy: {final_metrics['best_accuracy']:.4f} at epoch {final_metrics['best_epoch']}")
         print("-" * 50)
 
-print("All experiments completed!")
-print("Run 'expman tui' to view the experiments in the terminal UI")
-print("Or 'expman list' to see a list of experiments")
-print("Or 'expman list --sort final_accuracy --reverse' to see experiments sorted by accuracy")
\ No newline at end of file
+
+if __name__ == "__main__":
+    # Each experiment is independent, so run them across worker processes
+    max_workers = min(len(param_grid), os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        list(executor.map(run_one, param_grid))
+
+    print("All experiments completed!")
+    print("Run 'expman tui' to view the experiments in the terminal UI")
+    print("Or 'expman list' to see a list of experiments")
+    print("Or 'expman list --sort final_accuracy --reverse' to see experiments sorted by accuracy")
\ No newline at end of file
@@ -9,12 +9,14 @@ from kepler.api.experiment import (
     save_dataframe,
     save_dict,
     save_model,
+    save_records,
 )
 
 __all__ = [
     "experiment",
     "save_model",
     "save_dataframe",
+    "save_records",
     "save_dict",
     "get_experiment",
     "get_experiments",
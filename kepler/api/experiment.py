@@ -3,22 +3,35 @@ API for experiment management.
 """
 
 import contextlib
-import json
-import uuid
+import csv
+import secrets
 from pathlib import Path
-from typing import Any, Dict, Generator, Optional
+from typing import IO, Any, Dict, Generator, List, Optional, Tuple, Union
 
 import pandas as pd
 from pydantic import BaseModel
+from pydantic_core import to_json
 
 from kepler.models import (
+    AsyncLogWriter,
     Experiment,
     ExperimentList,
+    ExperimentStatus,
+    append_logs,
+    close_experiment_logs,
+    delete_experiment_dir,
     get_experiment_dir,
     load_experiments,
-    save_experiments,
+    remove_experiment,
+    save_experiment,
+    sync_experiment,
+    sync_file,
 )
 
+# Artifact files kept open while an experiment() context is running, keyed by
+# experiment ID and then by file path
+_OPEN_FILES: Dict[str, Dict[Path, IO[str]]] = {}
+
 
 @contextlib.contextmanager
 def experiment(
@@ -40,7 +53,7 @@ def experiment(
         The experiment object
     """
     # Generate a unique ID if not provided
-    experiment_id = id or f"{name}-{uuid.uuid4().hex[:8]}"
+    experiment_id = id or f"{name}-{secrets.token_hex(4)}"
 
     # Create the experiment
     exp = Experiment(
@@ -61,14 +74,16 @@ def experiment(
         for tag in tags:
             exp.add_tag(tag)
 
-    # Load existing experiments
-    experiment_list = load_experiments()
+    # Add the new experiment to the saved list
+    save_experiment(exp)
 
-    # Add the new experiment
-    experiment_list.add(exp)
+    # Append further logs to the experiment's log file from a background thread
+    writer = AsyncLogWriter(lambda logs: append_logs(exp))
+    exp.attach_writer(writer)
+    writer.start()
 
-    # Save the updated list
-    save_experiments(experiment_list)
+    # Keep artifact files open until the experiment finishes
+    _OPEN_FILES[exp.id] = {}
 
     try:
         # Yield the experiment to the caller
@@ -81,14 +96,25 @@ def experiment(
         exp.fail(str(e))
         raise
     finally:
-        # Update the experiment in the list
-        experiment_list = load_experiments()
-        experiment_list.add(exp)
-        save_experiments(experiment_list)
+        # Flush and close any artifact files left open
+        for f in _OPEN_FILES.pop(exp.id).values():
+            sync_file(f)
+            f.close()
+
+        # Flush pending logs and stop the background writer
+        exp.attach_writer(None)
+        writer.close()
+
+        # Update the experiment in the list, then make everything durable at once
+        save_experiment(exp)
+        sync_experiment(exp.id)
+        close_experiment_logs(exp.id)
 
 
 def save_model(
-    model: BaseModel, name: str, experiment_id: Optional[str] = None
+    model: BaseModel,
+    name: str,
+    experiment_id: Optional[Union[str, Experiment]] = None,
 ) -> Path:
     """
     Save a Pydantic model to disk.
@@ -96,68 +122,62 @@ def save_model(
     Args:
         model: The Pydantic model to save
         name: Name to give the saved model
-        experiment_id: ID of the experiment (uses the most recent running experiment if not provided)
+        experiment_id: ID of the experiment, or the experiment itself (uses the
+            most recent running experiment if not provided)
 
     Returns:
         Path to the saved model file
     """
-    # Get the experiment ID if not provided
-    if experiment_id is None:
-        experiment_list = load_experiments()
-        running_exps = experiment_list.running.sort_by("start_time", reverse=True)
-        if not running_exps:
-            raise ValueError("No running experiments found")
-        experiment_id = running_exps[0].id
+    # Find the experiment the artifact belongs to
+    exp_id, exp = _find_experiment(experiment_id)
 
     # Get the experiment directory
-    exp_dir = get_experiment_dir(experiment_id)
+    exp_dir = get_experiment_dir(exp_id)
 
     # Create the file path
     file_path = exp_dir / f"{name}.json"
 
     # Save the model
-    with open(file_path, "w") as f:
-        f.write(model.model_dump_json(indent=2))
+    _write_text(exp_id, file_path, model.model_dump_json(indent=2))
 
     # Update the experiment's artifacts
-    experiment_list = load_experiments()
-    exp = experiment_list.get(experiment_id)
     if exp:
-        exp.add_artifact(name, file_path)
-        experiment_list.add(exp)
-        save_experiments(experiment_list)
+        _record_artifact(exp, name, file_path)
 
     return file_path
 
 
 def save_dataframe(
-    df: pd.DataFrame,
+    df: Union[pd.DataFrame, List[Dict[str, Any]]],
     name: str,
-    experiment_id: Optional[str] = None,
-    format: str = "csv",
+    experiment_id: Optional[Union[str, Experiment]] = None,
+    format: str = "parquet",
 ) -> Path:
     """
     Save a pandas DataFrame to disk.
 
+    Parquet files are written with zstd compression, which is both faster to
+    write and smaller on disk than CSV.
+
     Args:
-        df: The DataFrame to save
+        df: The DataFrame to save, or a list of rows (see `save_records`)
         name: Name to give the saved DataFrame
-        experiment_id: ID of the experiment (uses the most recent running experiment if not provided)
-        format: Format to save the DataFrame in ("csv" or "parquet")
+        experiment_id: ID of the experiment, or the experiment itself (uses the
+            most recent running experiment if not provided)
+        format: Format to save the DataFrame in ("parquet" or "csv")
 
     Returns:
         Path to the saved DataFrame file
     """
-    # Get the experiment ID if not provided
-    if experiment_id is None:
-        experiment_list = load_experiments()
-        running_exps = experiment_list.running.sort_by("start_time", reverse=True)
-        if not running_exps:
-            raise ValueError("No running experiments found")
-        experiment_id = running_exps[0].id
+    # Plain rows can be written directly without building a DataFrame
+    if isinstance(df, list):
+        return save_records(df, name, experiment_id, format)
+
+    # Find the experiment the artifact belongs to
+    exp_id, exp = _find_experiment(experiment_id)
 
     # Get the experiment directory
-    exp_dir = get_experiment_dir(experiment_id)
+    exp_dir = get_experiment_dir(exp_id)
 
     # Create the file path based on the format
     if format.lower() == "csv":
@@ -165,23 +185,85 @@ def save_dataframe(
         df.to_csv(file_path, index=False)
     elif format.lower() == "parquet":
         file_path = exp_dir / f"{name}.parquet"
-        df.to_parquet(file_path, index=False)
+        df.to_parquet(
+            file_path,
+            engine="pyarrow",
+            index=False,
+            compression="zstd",
+            compression_level=3,
+        )
     else:
         raise ValueError(f"Unsupported format: {format}")
 
     # Update the experiment's artifacts
-    experiment_list = load_experiments()
-    exp = experiment_list.get(experiment_id)
     if exp:
-        exp.add_artifact(name, file_path)
-        experiment_list.add(exp)
-        save_experiments(experiment_list)
+        _record_artifact(exp, name, file_path)
+
+    return file_path
+
+
+def save_records(
+    rows: List[Dict[str, Any]],
+    name: str,
+    experiment_id: Optional[Union[str, Experiment]] = None,
+    format: str = "parquet",
+) -> Path:
+    """
+    Save a list of row dictionaries as a table, without going through pandas.
+
+    For the handful of rows typically collected per experiment, building a
+    DataFrame costs more than writing the file. Columns are taken from the
+    keys of the first row.
+
+    Args:
+        rows: The rows to save
+        name: Name to give the saved table
+        experiment_id: ID of the experiment, or the experiment itself (uses the
+            most recent running experiment if not provided)
+        format: Format to save the table in ("parquet" or "csv")
+
+    Returns:
+        Path to the saved table file
+    """
+    # Find the experiment the artifact belongs to
+    exp_id, exp = _find_experiment(experiment_id)
+
+    # Get the experiment directory
+    exp_dir = get_experiment_dir(exp_id)
+
+    # Create the file path based on the format
+    if format.lower() == "csv":
+        file_path = exp_dir / f"{name}.csv"
+        with open(file_path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0]) if rows else [])
+            writer.writeheader()
+            writer.writerows(rows)
+    elif format.lower() == "parquet":
+        # Imported here since pyarrow is slow to import and only needed here
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        file_path = exp_dir / f"{name}.parquet"
+        pq.write_table(
+            pa.Table.from_pylist(rows),
+            file_path,
+            compression="zstd",
+            compression_level=3,
+        )
+    else:
+        raise ValueError(f"Unsupported format: {format}")
+
+    # Update the experiment's artifacts
+    if exp:
+        _record_artifact(exp, name, file_path)
 
     return file_path
 
 
 def save_dict(
-    data: Dict[str, Any], name: str, experiment_id: Optional[str] = None
+    data: Dict[str, Any],
+    name: str,
+    experiment_id: Optional[Union[str, Experiment]] = None,
 ) -> Path:
     """
     Save a dictionary to disk as JSON.
@@ -189,40 +271,106 @@ def save_dict(
     Args:
         data: The dictionary to save
         name: Name to give the saved dictionary
-        experiment_id: ID of the experiment (uses the most recent running experiment if not provided)
+        experiment_id: ID of the experiment, or the experiment itself (uses the
+            most recent running experiment if not provided)
 
     Returns:
         Path to the saved JSON file
     """
-    # Get the experiment ID if not provided
-    if experiment_id is None:
-        experiment_list = load_experiments()
-        running_exps = experiment_list.running.sort_by("start_time", reverse=True)
-        if not running_exps:
-            raise ValueError("No running experiments found")
-        experiment_id = running_exps[0].id
+    # Find the experiment the artifact belongs to
+    exp_id, exp = _find_experiment(experiment_id)
 
     # Get the experiment directory
-    exp_dir = get_experiment_dir(experiment_id)
+    exp_dir = get_experiment_dir(exp_id)
 
     # Create the file path
     file_path = exp_dir / f"{name}.json"
 
     # Save the dictionary
-    with open(file_path, "w") as f:
-        json.dump(data, f, indent=2)
+    _write_text(exp_id, file_path, to_json(data, indent=2).decode())
 
     # Update the experiment's artifacts
-    experiment_list = load_experiments()
-    exp = experiment_list.get(experiment_id)
     if exp:
-        exp.add_artifact(name, file_path)
-        experiment_list.add(exp)
-        save_experiments(experiment_list)
+        _record_artifact(exp, name, file_path)
 
     return file_path
 
 
+def _find_experiment(
+    experiment_id: Optional[Union[str, Experiment]],
+) -> Tuple[str, Optional[Experiment]]:
+    """
+    Find the experiment an artifact should be saved for.
+
+    Args:
+        experiment_id: ID of the experiment, the experiment itself, or None for
+            the most recent running experiment
+
+    Returns:
+        The experiment's ID and the experiment, or None if it isn't saved
+    """
+    # A live experiment needs no registry lookup
+    if isinstance(experiment_id, Experiment):
+        return experiment_id.id, experiment_id
+
+    experiment_list = load_experiments()
+
+    # Use the most recent running experiment if no ID was provided
+    if experiment_id is None:
+        exp = experiment_list.most_recent_running()
+        if exp is None:
+            raise ValueError("No running experiments found")
+        return exp.id, exp
+
+    return experiment_id, experiment_list.get(experiment_id)
+
+
+def _record_artifact(exp: Experiment, name: str, file_path: Path) -> None:
+    """
+    Record a saved artifact on its experiment and persist the change.
+
+    An experiment running in an `experiment()` context has a background
+    writer attached that persists the new log entry along with the rest of
+    its logs; any other experiment is saved directly.
+
+    Args:
+        exp: The experiment the artifact belongs to
+        name: Name of the artifact
+        file_path: Path to the artifact file
+    """
+    exp.add_artifact(name, file_path)
+    if exp._writer is None:
+        save_experiment(exp)
+
+
+def _write_text(experiment_id: str, file_path: Path, text: str) -> None:
+    """
+    Write the contents of an artifact file.
+
+    While the experiment's context is running the file is kept open, and
+    saving the same artifact again overwrites it in place.
+
+    Args:
+        experiment_id: ID of the experiment the artifact belongs to
+        file_path: Path to the artifact file
+        text: The new contents of the file
+    """
+    files = _OPEN_FILES.get(experiment_id)
+    if files is None:
+        with open(file_path, "w") as out:
+            out.write(text)
+        return
+
+    f = files.get(file_path)
+    if f is None:
+        f = files[file_path] = open(file_path, "w")
+    else:
+        f.seek(0)
+        f.truncate()
+    f.write(text)
+    f.flush()
+
+
 def get_experiment(experiment_id: str) -> Optional[Experiment]:
     """
     Get an experiment by ID.
@@ -237,14 +385,17 @@ def get_experiment(experiment_id: str) -> Optional[Experiment]:
     return experiment_list.get(experiment_id)
 
 
-def get_experiments() -> ExperimentList:
+def get_experiments(status: Optional[ExperimentStatus] = None) -> ExperimentList:
     """
     Get all experiments.
 
+    Args:
+        status: If given, only get experiments with this status
+
     Returns:
         List of all experiments
     """
-    return load_experiments()
+    return load_experiments(status=status)
 
 
 def delete_experiment(experiment_id: str) -> bool:
@@ -257,21 +408,12 @@ def delete_experiment(experiment_id: str) -> bool:
     Returns:
         True if the experiment was deleted, False otherwise
     """
-    experiment_list = load_experiments()
-    exp = experiment_list.get(experiment_id)
-
-    if not exp:
-        return False
-
     # Remove the experiment from the list
-    experiment_list.remove(experiment_id)
-    save_experiments(experiment_list)
+    if not remove_experiment(experiment_id):
+        return False
+    close_experiment_logs(experiment_id)
 
     # Delete the experiment directory
-    exp_dir = get_experiment_dir(experiment_id)
-    if exp_dir.exists():
-        import shutil
-
-        shutil.rmtree(exp_dir)
+    delete_experiment_dir(experiment_id)
 
     return True
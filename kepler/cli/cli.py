@@ -12,6 +12,27 @@ from kepler.api import delete_experiment, get_experiment, get_experiments
 from kepler.models import ExperimentStatus, get_app_dir
 from kepler.tui.app import run_tui
 
+# Colors used to display each experiment status
+_STATUS_COLORS = {
+    ExperimentStatus.RUNNING: "blue",
+    ExperimentStatus.COMPLETED: "green",
+    ExperimentStatus.ERROR: "red",
+    ExperimentStatus.INTERRUPTED: "yellow",
+}
+
+# Duration display units as (upper bound in seconds, seconds per unit, suffix)
+_DURATION_UNITS = ((60, 1, "s"), (3600, 60, "m"), (float("inf"), 3600, "h"))
+
+
+def _format_duration(duration: Optional[float]) -> str:
+    """Format a duration in seconds using the largest sensible unit."""
+    if duration is None:
+        return "N/A"
+    for bound, scale, suffix in _DURATION_UNITS:
+        if duration < bound:
+            return f"{duration / scale:.1f}{suffix}"
+    return "N/A"
+
 
 @click.group()
 @click.version_option()
@@ -21,9 +42,14 @@ def cli():
 
 
 @cli.command()
-def tui():
+@click.option(
+    "--watch/--no-watch",
+    default=True,
+    help="Refresh automatically when experiment files change",
+)
+def tui(watch):
     """Launch the terminal UI for monitoring experiments."""
-    run_tui()
+    run_tui(watch_mode=watch)
 
 
 @cli.command()
@@ -47,12 +73,10 @@ def list(status: Optional[str], tag: List[str], sort: str, reverse: bool):
     """List experiments."""
     console = Console()
 
-    # Load experiments
-    experiment_list = get_experiments()
-
-    # Filter by status if provided
-    if status:
-        experiment_list = experiment_list.filter(status=ExperimentStatus(status))
+    # Load experiments, only reading those with the requested status
+    experiment_list = get_experiments(
+        status=ExperimentStatus(status) if status else None
+    )
 
     # Filter by tags if provided
     if tag:
@@ -76,38 +100,20 @@ def list(status: Optional[str], tag: List[str], sort: str, reverse: bool):
 
     # Add rows
     for exp in experiments:
-        # Format duration
-        duration = exp.duration
-        if duration is not None:
-            if duration < 60:
-                duration_str = f"{duration:.1f}s"
-            elif duration < 3600:
-                duration_str = f"{duration / 60:.1f}m"
-            else:
-                duration_str = f"{duration / 3600:.1f}h"
-        else:
-            duration_str = "N/A"
-
         # Format status with color
-        status_colors = {
-            ExperimentStatus.RUNNING: "blue",
-            ExperimentStatus.COMPLETED: "green",
-            ExperimentStatus.ERROR: "red",
-            ExperimentStatus.INTERRUPTED: "yellow",
-        }
-        status_str = (
-            f"[{status_colors[exp.status]}]{exp.status}[/{status_colors[exp.status]}]"
-        )
+        exp_status = exp.status
+        color = _STATUS_COLORS[exp_status]
+        status_str = f"[{color}]{exp_status}[/{color}]"
 
         # Format tags
-        tags_str = ", ".join(exp.tags) if exp.tags else ""
+        tags_str = ", ".join(exp.tags)
 
         table.add_row(
             exp.id,
             exp.name,
             status_str,
             exp.start_time.strftime("%Y-%m-%d %H:%M:%S"),
-            duration_str,
+            _format_duration(exp.duration),
             tags_str,
         )
 
@@ -153,8 +159,14 @@ def info(experiment_id: str):
     # Print metrics
     if exp.metrics:
         console.print("\n[bold]Metrics:[/bold]")
+        metric_series = exp.metric_series
         for key, value in exp.metrics.items():
-            console.print(f"  {key}: {value}")
+            # Summarize metrics that were recorded more than once
+            count = len(metric_series[key])
+            if count > 1:
+                console.print(f"  {key}: {value} (latest of {count} values)")
+            else:
+                console.print(f"  {key}: {value}")
 
     # Print artifacts
     if exp.artifacts:
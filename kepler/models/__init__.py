@@ -1,6 +1,7 @@
 """
 Models for experiment management.
 """
+from kepler.models.async_writer import AsyncLogWriter
 from kepler.models.experiment import (
     Experiment, 
     ExperimentList, 
@@ -23,14 +24,23 @@ from kepler.models.log import (
     TagLog
 )
 from kepler.models.storage import (
+    append_logs,
+    close_experiment_logs,
+    delete_experiment_dir,
     get_app_dir,
     get_experiment_dir,
+    get_experiment_logs_path,
     get_experiments_file_path,
     load_experiments,
+    remove_experiment,
+    save_experiment,
     save_experiments,
+    sync_experiment,
+    sync_file,
 )
 
 __all__ = [
+    "AsyncLogWriter",
     "Experiment",
     "ExperimentList",
     "ExperimentStatus",
@@ -48,9 +58,17 @@ __all__ = [
     "ResourceLog",
     "ConfigLog",
     "TagLog",
+    "append_logs",
+    "close_experiment_logs",
+    "delete_experiment_dir",
     "get_app_dir",
     "get_experiment_dir",
+    "get_experiment_logs_path",
     "get_experiments_file_path",
     "load_experiments",
+    "remove_experiment",
+    "save_experiment",
     "save_experiments",
+    "sync_experiment",
+    "sync_file",
 ]
\ No newline at end of file
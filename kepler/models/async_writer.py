@@ -0,0 +1,76 @@
+"""
+Background writer for persisting experiment logs.
+"""
+
+import queue
+import threading
+import time
+from typing import Callable, List
+
+import click
+
+from kepler.models.log import BaseLog
+
+# Marker placed on the queue to tell the writer thread to flush and exit
+_SENTINEL = object()
+
+
+class AsyncLogWriter:
+    """
+    Background thread that batches submitted log entries.
+
+    Entries are accumulated for up to `interval` seconds and handed to the
+    flush callback as a single batch, so bursts of logs cost one write.
+    """
+
+    def __init__(
+        self, flush: Callable[[List[BaseLog]], None], interval: float = 0.25
+    ):
+        self.flush = flush
+        self.interval = interval
+        self._queue: "queue.Queue[object]" = queue.Queue()
+        self._thread = threading.Thread(
+            target=self._run, name="kepler-log-writer", daemon=True
+        )
+
+    def start(self) -> None:
+        """Start the writer thread."""
+        self._thread.start()
+
+    def submit(self, log: BaseLog) -> None:
+        """Queue a log entry for writing."""
+        self._queue.put(log)
+
+    def close(self) -> None:
+        """Flush any pending entries and stop the writer thread."""
+        self._queue.put(_SENTINEL)
+        self._thread.join()
+
+    def _run(self) -> None:
+        """Drain the queue in batches until the sentinel is received."""
+        while True:
+            # Block until there is something to write
+            item = self._queue.get()
+
+            # Keep collecting until the interval elapses or we are closed
+            batch: List[BaseLog] = []
+            deadline = time.monotonic() + self.interval
+            while item is not _SENTINEL:
+                batch.append(item)  # type: ignore[arg-type]
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+
+            if batch:
+                try:
+                    self.flush(batch)
+                except Exception as e:
+                    # Keep the thread alive; the final save will retry
+                    click.echo(f"Error writing experiment logs: {e}", err=True)
+
+            if item is _SENTINEL:
+                return
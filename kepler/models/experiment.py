@@ -2,14 +2,26 @@
 Experiment model definitions.
 """
 
+import os
 from datetime import datetime
 from enum import Enum
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import (
+    Any,
+    Callable,
+    ClassVar,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 
-from kepler.models.log import ExperimentLog, LogKind
+from kepler.models.async_writer import AsyncLogWriter
+from kepler.models.log import BaseLog, ExperimentLog, LogKind
 
 
 class ExperimentStatus(str, Enum):
@@ -28,7 +40,33 @@ class Experiment(BaseModel):
 
     id: str
     name: str
-    logs: List[ExperimentLog] = Field(default_factory=list)
+    logs: List[BaseLog] = Field(default_factory=list)
+
+    # Whether progress and resource updates are recorded. They only feed live
+    # monitoring, so headless runs can skip them with KEPLER_LOG_PROGRESS=0
+    record_progress: ClassVar[bool] = os.environ.get("KEPLER_LOG_PROGRESS", "1") != "0"
+
+    # Background writer that new logs are forwarded to, if attached
+    _writer: Optional[AsyncLogWriter] = PrivateAttr(default=None)
+
+    # Number of leading log entries already written to the experiment's log file
+    _persisted: int = PrivateAttr(default=0)
+
+    # Whether this is a new run, whose first save replaces any log file left
+    # by an earlier run with the same ID. Experiments read from disk are not
+    _new_run: bool = PrivateAttr(default=True)
+
+    # Index of the log entries folded in so far by `_scan`: the entries of
+    # each kind in order, plus the latest end or error entry, whether the
+    # latest end entry was an interruption, the tag set and the values of
+    # each metric, so that properties don't re-scan every log on each access
+    _scanned: int = PrivateAttr(default=0)
+    _scanned_logs: Optional[List[BaseLog]] = PrivateAttr(default=None)
+    _by_kind: Dict[LogKind, List[BaseLog]] = PrivateAttr(default_factory=dict)
+    _finish_log: Optional[BaseLog] = PrivateAttr(default=None)
+    _interrupted: bool = PrivateAttr(default=False)
+    _tags: Dict[str, None] = PrivateAttr(default_factory=dict)
+    _metric_values: Dict[str, List[Any]] = PrivateAttr(default_factory=dict)
     
     def __init__(self, **data):
         # Extract tags if present
@@ -40,25 +78,91 @@ class Experiment(BaseModel):
         if not self.logs:
             self.start()
             
-        # Add tags if provided
+        # Add tags if provided, dropping duplicates and tags already present
+        # in the given logs with a single scan of those logs
         if tags:
-            for tag in tags:
-                self.add_tag(tag)
+            self._scan()
+            for tag in dict.fromkeys(tags):
+                if tag not in self._tags:
+                    self.logs.append(ExperimentLog.tag(tag))
+
+    def _scan(self) -> None:
+        """Fold log entries added since the last call into the log index."""
+        logs = self.logs
+
+        # Start over if the log list was replaced
+        if logs is not self._scanned_logs or len(logs) < self._scanned:
+            self._scanned_logs = logs
+            self._scanned = 0
+            self._by_kind = {}
+            self._finish_log = None
+            self._interrupted = False
+            self._tags = {}
+            self._metric_values = {}
+
+        # Enum members are singletons, so kinds are compared by identity, with
+        # the members bound to locals outside the loop
+        end, error = LogKind.END, LogKind.ERROR
+        tag, metric = LogKind.TAG, LogKind.METRIC
+        by_kind = self._by_kind
+        for i in range(self._scanned, len(logs)):
+            log = logs[i]
+            kind = log.kind
+            bucket = by_kind.get(kind)
+            if bucket is None:
+                bucket = by_kind[kind] = []
+            bucket.append(log)
+
+            if kind is end:
+                self._finish_log = log
+                self._interrupted = "interrupted" in log.message.lower()
+            elif kind is error:
+                self._finish_log = log
+            elif kind is tag:
+                self._tags[log.data["tag"]] = None
+            elif kind is metric:
+                values = self._metric_values.get(log.data["name"])
+                if values is None:
+                    values = self._metric_values[log.data["name"]] = []
+                values.append(log.data["value"])
+        self._scanned = len(logs)
+
+    def _logs_of(self, kind: LogKind) -> List[BaseLog]:
+        """Get the log entries of one kind, in the order they were added."""
+        self._scan()
+        return self._by_kind.get(kind, [])
+
+    def _latest(self, kind: LogKind) -> Optional[BaseLog]:
+        """Get the most recent log entry of one kind, if there is one."""
+        logs = self._logs_of(kind)
+        return logs[-1] if logs else None
+
+    def _collect(self, kind: LogKind, key: str, value: str) -> Dict[str, Any]:
+        """
+        Collect the log entries of one kind into a dictionary.
+
+        Args:
+            kind: Kind of log entries to collect
+            key: Name of the `data` item to use as the dictionary key
+            value: Name of the `data` item to use as the dictionary value
+
+        Returns:
+            The collected values, with later entries overriding earlier ones
+        """
+        return {log.data[key]: log.data[value] for log in self._logs_of(kind)}
 
     @property
     def status(self) -> ExperimentStatus:
         """Get the current status of the experiment."""
-        # Check for error logs
-        for log in reversed(self.logs):
-            if log.kind == LogKind.ERROR:
-                return ExperimentStatus.ERROR
-
-        # Check for end logs
-        for log in reversed(self.logs):
-            if log.kind == LogKind.END:
-                if "interrupted" in log.message.lower():
-                    return ExperimentStatus.INTERRUPTED
-                return ExperimentStatus.COMPLETED
+        # Any error log means the experiment failed
+        if self._latest(LogKind.ERROR) is not None:
+            return ExperimentStatus.ERROR
+
+        # Otherwise the latest end log decides how it finished
+        if self._latest(LogKind.END) is not None:
+            if self._interrupted:
+                return ExperimentStatus.INTERRUPTED
+            return ExperimentStatus.COMPLETED
 
         # If no end or error logs, the experiment is running
         return ExperimentStatus.RUNNING
@@ -66,87 +170,91 @@ class Experiment(BaseModel):
     @property
     def start_time(self) -> datetime:
         """Get the start time of the experiment."""
-        for log in self.logs:
-            if log.kind == LogKind.START:
-                return log.created_at
+        start_logs = self._logs_of(LogKind.START)
+        if start_logs:
+            return start_logs[0].created_at
         # If no start log, use the timestamp of the first log
         return self.logs[0].created_at if self.logs else datetime.now()
 
     @property
     def end_time(self) -> Optional[datetime]:
         """Get the end time of the experiment."""
-        for log in reversed(self.logs):
-            if log.kind == LogKind.END or log.kind == LogKind.ERROR:
-                return log.created_at
+        self._scan()
+        if self._finish_log is not None:
+            return self._finish_log.created_at
         return None
 
     @property
     def duration(self) -> Optional[float]:
         """Get the duration of the experiment in seconds."""
-        if self.end_time is None:
-            if self.status == ExperimentStatus.RUNNING:
-                # For running experiments, calculate duration up to now
-                return (datetime.now() - self.start_time).total_seconds()
-            return None
-        return (self.end_time - self.start_time).total_seconds()
+        start_time = self.start_time
+
+        # Without an end or error log the experiment is still running, so
+        # calculate the duration up to now
+        if self._finish_log is None:
+            return (datetime.now() - start_time).total_seconds()
+        return (self._finish_log.created_at - start_time).total_seconds()
 
     @property
     def config(self) -> Dict[str, Any]:
         """Get the configuration of the experiment."""
-        config = {}
-        for log in self.logs:
-            if log.kind == LogKind.CONFIG:
-                config[log.data["key"]] = log.data["value"]
-        return config
+        return self._collect(LogKind.CONFIG, "key", "value")
 
     @property
     def metrics(self) -> Dict[str, Any]:
         """Get the metrics of the experiment."""
-        metrics = {}
-        for log in self.logs:
-            if log.kind == LogKind.METRIC:
-                metrics[log.data["name"]] = log.data["value"]
-        return metrics
+        self._scan()
+        return {name: values[-1] for name, values in self._metric_values.items()}
+
+    @property
+    def metric_series(self) -> Dict[str, List[Any]]:
+        """Get every recorded value of each metric, in the order they were set."""
+        self._scan()
+        return {name: list(values) for name, values in self._metric_values.items()}
 
     @property
     def artifacts(self) -> Dict[str, Path]:
         """Get the artifacts of the experiment."""
-        artifacts = {}
-        for log in self.logs:
-            if log.kind == LogKind.ARTIFACT:
-                artifacts[log.data["name"]] = log.data["path"]
-        return artifacts
+        # Entries read back from disk hold their paths as strings
+        return {
+            name: Path(path)
+            for name, path in self._collect(LogKind.ARTIFACT, "name", "path").items()
+        }
 
     @property
     def error(self) -> Optional[str]:
         """Get the error message of the experiment."""
-        for log in reversed(self.logs):
-            if log.kind == LogKind.ERROR:
-                return log.message
-        return None
+        error_log = self._latest(LogKind.ERROR)
+        return error_log.message if error_log is not None else None
 
     @property
     def tags(self) -> List[str]:
         """Get the tags of the experiment."""
-        tags = []
-        for log in self.logs:
-            if log.kind == LogKind.TAG:
-                tag = log.data["tag"]
-                if tag not in tags:
-                    tags.append(tag)
-        return tags
+        self._scan()
+        return list(self._tags)
 
     @property
     def progress(self) -> Optional[Dict[str, Any]]:
-        """Get the latest progress of the experiment."""
-        for log in reversed(self.logs):
-            if log.kind == LogKind.PROGRESS:
-                return log.data
-        return None
+        """Get the latest progress of the experiment, including its percentage."""
+        progress_log = self._latest(LogKind.PROGRESS)
+        if progress_log is None:
+            return None
 
-    def add_log(self, log: ExperimentLog) -> None:
+        # Entries don't store the percentage, so derive it here
+        data = progress_log.data
+        if "percentage" not in data:
+            data = {**data, "percentage": data["current"] / data["total"] * 100}
+        return data
+
+    def add_log(self, log: BaseLog) -> None:
         """Add a log entry to the experiment."""
         self.logs.append(log)
+        if self._writer is not None:
+            self._writer.submit(log)
+
+    def attach_writer(self, writer: Optional[AsyncLogWriter]) -> None:
+        """Forward new log entries to a background writer (None to detach)."""
+        self._writer = writer
 
     def start(self, message: str = "Experiment started") -> None:
         """Mark the experiment as started."""
@@ -166,7 +274,12 @@ class Experiment(BaseModel):
         self.add_log(ExperimentLog.end("Experiment interrupted"))
 
     def set_metric(self, name: str, value: Any) -> None:
-        """Set a metric for the experiment."""
+        """
+        Set a metric for the experiment.
+
+        Setting the same metric repeatedly (e.g. once per epoch) records a
+        series of values; see `metric_series`.
+        """
         self.add_log(ExperimentLog.metric(name, value))
 
     def add_artifact(self, name: str, path: Path) -> None:
@@ -175,7 +288,9 @@ class Experiment(BaseModel):
 
     def add_tag(self, tag: str) -> None:
         """Add a tag to the experiment."""
-        if tag not in self.tags:
+        # Check the cached tag set rather than building the tag list
+        self._scan()
+        if tag not in self._tags:
             self.add_log(ExperimentLog.tag(tag))
 
     def set_config(self, key: str, value: Any) -> None:
@@ -184,6 +299,8 @@ class Experiment(BaseModel):
 
     def update_progress(self, current: int, total: int, message: str = "") -> None:
         """Update the progress of the experiment."""
+        if not self.record_progress:
+            return
         self.add_log(ExperimentLog.progress(current, total, message))
 
     def log_info(self, message: str) -> None:
@@ -196,9 +313,22 @@ class Experiment(BaseModel):
 
     def log_resource(self, resource_type: str, usage: Any) -> None:
         """Log resource usage."""
+        if not self.record_progress:
+            return
         self.add_log(ExperimentLog.resource(resource_type, usage))
 
 
+# Key functions for the attributes experiments are usually sorted by. Running
+# experiments have no end time, so they sort as ending after all others
+_SORT_KEYS: Dict[str, Callable[[Experiment], Any]] = {
+    "name": lambda exp: exp.name,
+    "start_time": lambda exp: exp.start_time,
+    "end_time": lambda exp: (exp.end_time is None, exp.end_time or datetime.min),
+    "status": lambda exp: exp.status.value,
+    "duration": lambda exp: exp.duration,
+}
+
+
 class ExperimentList(BaseModel):
     """
     Model representing a list of experiments.
@@ -206,10 +336,25 @@ class ExperimentList(BaseModel):
 
     experiments: Dict[str, Experiment] = Field(default_factory=dict)
 
+    # Secondary indexes from status and tag to experiment IDs. Each indexed
+    # experiment is recorded with its log count, status and tags at the time,
+    # and `_reindex` refreshes the ones whose logs have changed since
+    _by_status: Dict[ExperimentStatus, Dict[str, None]] = PrivateAttr(
+        default_factory=dict
+    )
+    _by_tag: Dict[str, Dict[str, None]] = PrivateAttr(default_factory=dict)
+    _indexed: Dict[str, Tuple[Experiment, int, ExperimentStatus, List[str]]] = (
+        PrivateAttr(default_factory=dict)
+    )
+
     def add(self, experiment: Experiment) -> None:
         """Add an experiment to the list."""
         self.experiments[experiment.id] = experiment
 
+    def add_many(self, experiments: Iterable[Experiment]) -> None:
+        """Add several experiments to the list."""
+        self.experiments.update((exp.id, exp) for exp in experiments)
+
     def get(self, experiment_id: str) -> Optional[Experiment]:
         """Get an experiment by ID."""
         return self.experiments.get(experiment_id)
@@ -218,6 +363,38 @@ class ExperimentList(BaseModel):
         """Remove an experiment from the list."""
         if experiment_id in self.experiments:
             del self.experiments[experiment_id]
+            self._unindex(experiment_id)
+
+    def _reindex(self) -> None:
+        """Bring the status and tag indexes up to date with the experiments."""
+        indexed = self._indexed
+        for exp_id, exp in self.experiments.items():
+            entry = indexed.get(exp_id)
+            if entry is not None and entry[0] is exp and entry[1] == len(exp.logs):
+                continue
+            if entry is not None:
+                self._unindex(exp_id)
+
+            status, tags = exp.status, exp.tags
+            self._by_status.setdefault(status, {})[exp_id] = None
+            for tag in tags:
+                self._by_tag.setdefault(tag, {})[exp_id] = None
+            indexed[exp_id] = (exp, len(exp.logs), status, tags)
+
+        # Drop experiments that were removed from the dictionary directly
+        if len(indexed) != len(self.experiments):
+            for exp_id in [i for i in indexed if i not in self.experiments]:
+                self._unindex(exp_id)
+
+    def _unindex(self, experiment_id: str) -> None:
+        """Remove an experiment from the status and tag indexes."""
+        entry = self._indexed.pop(experiment_id, None)
+        if entry is None:
+            return
+        _, _, status, tags = entry
+        self._by_status[status].pop(experiment_id, None)
+        for tag in tags:
+            self._by_tag[tag].pop(experiment_id, None)
 
     def filter(
         self,
@@ -234,23 +411,40 @@ class ExperimentList(BaseModel):
         Returns:
             A new ExperimentList with filtered experiments
         """
-        filtered = ExperimentList()
+        self._reindex()
 
         # Convert single status to list for consistent handling
         status_list = [status] if isinstance(status, ExperimentStatus) else status
 
-        for exp_id, exp in self.experiments.items():
-            # Check status filter
-            if status_list and exp.status not in status_list:
-                continue
-
-            # Check tags filter (all specified tags must be present)
-            if tags and not all(tag in exp.tags for tag in tags):
-                continue
-
-            filtered.add(exp)
-
-        return filtered
+        # Narrow down the candidate IDs using the indexes, starting from the
+        # experiments with any of the requested statuses
+        candidates: Optional[set] = None
+        if status_list:
+            candidates = set()
+            for exp_status in status_list:
+                candidates.update(self._by_status.get(exp_status, ()))
+
+        # Intersect with the experiments having each tag
+        for tag in tags or []:
+            tagged = self._by_tag.get(tag, {})
+            if candidates is None:
+                candidates = set(tagged)
+            else:
+                candidates.intersection_update(tagged)
+
+        # The experiments are already validated, so the result is built
+        # without copying them through validation again
+        if candidates is None:
+            return ExperimentList.model_construct(experiments=dict(self.experiments))
+
+        # Keep the experiments in their original order
+        return ExperimentList.model_construct(
+            experiments={
+                exp_id: exp
+                for exp_id, exp in self.experiments.items()
+                if exp_id in candidates
+            }
+        )
 
     def sort_by(self, key: str, reverse: bool = False) -> List[Experiment]:
         """
@@ -263,10 +457,24 @@ class ExperimentList(BaseModel):
         Returns:
             Sorted list of experiments
         """
-        return sorted(
-            self.experiments.values(),
-            key=lambda exp: getattr(exp, key, None),
-            reverse=reverse,
+        key_fn = _SORT_KEYS.get(key) or (lambda exp: getattr(exp, key, None))
+        return sorted(self.experiments.values(), key=key_fn, reverse=reverse)
+
+    def most_recent_running(self) -> Optional[Experiment]:
+        """
+        Get the running experiment that started most recently.
+
+        Returns:
+            The most recently started running experiment, or None if none are running
+        """
+        return max(
+            (
+                exp
+                for exp in self.experiments.values()
+                if exp.status is ExperimentStatus.RUNNING
+            ),
+            key=lambda exp: exp.start_time,
+            default=None,
         )
 
     @property
@@ -288,3 +496,16 @@ class ExperimentList(BaseModel):
     def count(self) -> int:
         """Get the number of experiments."""
         return len(self.experiments)
+
+    def status_counts(self) -> Dict[ExperimentStatus, int]:
+        """
+        Count the experiments with each status.
+
+        Returns:
+            Dictionary mapping every status to its number of experiments
+        """
+        self._reindex()
+        return {
+            status: len(self._by_status.get(status, ()))
+            for status in ExperimentStatus
+        }
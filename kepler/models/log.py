@@ -2,7 +2,9 @@
 Log model definitions for experiments.
 """
 
+import sys
 from datetime import datetime
+from functools import cached_property
 from enum import Enum
 from pathlib import Path
 from typing import Any, Dict, Literal, Optional
@@ -29,12 +31,31 @@ class LogKind(str, Enum):
 class BaseLog(BaseModel):
     """
     Base log entry for an experiment.
+
+    Experiments hold their logs as `BaseLog` entries: the typed subclasses
+    below when created in-process, and plain `BaseLog` entries when read back
+    from disk, with the typed values kept in `data`.
     """
     created_at: datetime = Field(default_factory=datetime.now)
     kind: LogKind
     message: str = ""
     data: Dict[str, Any] = Field(default_factory=dict)
 
+    # Alias timestamp to created_at for backward compatibility
+    @property
+    def timestamp(self) -> datetime:
+        return self.created_at
+
+    # Alias type to kind for backward compatibility
+    @property
+    def type(self) -> LogKind:
+        return self.kind
+
+    @cached_property
+    def timestamp_str(self) -> str:
+        """Format the creation time for display, once per entry."""
+        return self.created_at.strftime("%Y-%m-%d %H:%M:%S")
+
 
 class StartLog(BaseLog):
     """Log entry for experiment start."""
@@ -55,9 +76,9 @@ class ProgressLog(BaseLog):
     total: int
     message: str = ""
     
-    @property
+    @cached_property
     def percentage(self) -> float:
-        """Calculate the progress percentage."""
+        """Calculate the progress percentage, once per entry."""
         return self.current / self.total * 100
     
     def model_post_init(self, __context: Any) -> None:
@@ -66,12 +87,11 @@ class ProgressLog(BaseLog):
         if not self.message:
             self.message = f"Progress: {self.current}/{self.total}"
         
-        # Update data with progress information
-        self.data.update({
-            "current": self.current,
-            "total": self.total,
-            "percentage": self.percentage,
-        })
+        # Update data with progress information; the percentage is left out
+        # since it is rarely read and can be derived from these on demand
+        data = self.data
+        data["current"] = self.current
+        data["total"] = self.total
 
 
 class MetricLog(BaseLog):
@@ -88,10 +108,9 @@ class MetricLog(BaseLog):
             self.message = f"Metric: {self.name} = {self.value}"
         
         # Update data with metric information
-        self.data.update({
-            "name": self.name,
-            "value": self.value,
-        })
+        data = self.data
+        data["name"] = self.name
+        data["value"] = self.value
 
 
 class ArtifactLog(BaseLog):
@@ -108,10 +127,9 @@ class ArtifactLog(BaseLog):
             self.message = f"Artifact saved: {self.name} at {self.path}"
         
         # Update data with artifact information
-        self.data.update({
-            "name": self.name,
-            "path": self.path,
-        })
+        data = self.data
+        data["name"] = self.name
+        data["path"] = self.path
 
 
 class ErrorLog(BaseLog):
@@ -123,7 +141,7 @@ class ErrorLog(BaseLog):
         """Post-initialization processing."""
         # Update data with error details if provided
         if self.error_details:
-            self.data.update({"error_details": self.error_details})
+            self.data["error_details"] = self.error_details
 
 
 class InfoLog(BaseLog):
@@ -150,10 +168,9 @@ class ResourceLog(BaseLog):
             self.message = f"Resource usage: {self.resource_type} = {self.usage}"
         
         # Update data with resource information
-        self.data.update({
-            "resource_type": self.resource_type,
-            "usage": self.usage,
-        })
+        data = self.data
+        data["resource_type"] = self.resource_type
+        data["usage"] = self.usage
 
 
 class ConfigLog(BaseLog):
@@ -170,10 +187,9 @@ class ConfigLog(BaseLog):
             self.message = f"Config: {self.key} = {self.value}"
         
         # Update data with config information
-        self.data.update({
-            "key": self.key,
-            "value": self.value,
-        })
+        data = self.data
+        data["key"] = self.key
+        data["value"] = self.value
 
 
 class TagLog(BaseLog):
@@ -189,7 +205,7 @@ class TagLog(BaseLog):
             self.message = f"Tag added: {self.tag}"
         
         # Update data with tag information
-        self.data.update({"tag": self.tag})
+        self.data["tag"] = self.tag
 
 
 # For backward compatibility
@@ -203,25 +219,17 @@ class ExperimentLog(BaseLog):
     # Required field for BaseLog, but will be set by factory methods
     kind: LogKind = LogKind.INFO
     
-    # Alias timestamp to created_at for backward compatibility
-    @property
-    def timestamp(self) -> datetime:
-        return self.created_at
-    
-    # Alias type to kind for backward compatibility
-    @property
-    def type(self) -> LogKind:
-        return self.kind
-    
     @classmethod
     def start(cls, message: str = "Experiment started") -> StartLog:
         """Create a start log entry."""
-        return StartLog(message=message)
+        # Start and end messages come from a handful of fixed strings, so
+        # every entry can share a single copy of each
+        return StartLog(message=sys.intern(message))
 
     @classmethod
     def end(cls, message: str = "Experiment completed") -> EndLog:
         """Create an end log entry."""
-        return EndLog(message=message)
+        return EndLog(message=sys.intern(message))
 
     @classmethod
     def progress(cls, current: int, total: int, message: str = "") -> ProgressLog:
@@ -1,21 +1,70 @@
 """
 Storage functionality for experiment data.
+
+Experiments are stored as a small index file (`experiments.json`) holding each
+experiment's ID, name and last saved status, plus one append-only `logs.jsonl` file per experiment
+in its directory. Adding a log entry therefore appends a single line instead of
+rewriting every experiment.
 """
 
-import json
+import contextlib
+import functools
 import os
+import shutil
+import threading
 from pathlib import Path
+from typing import IO, Any, Dict, Generator, List, Optional, Tuple
 
 import click
+from pydantic import TypeAdapter
+from pydantic_core import from_json, to_json
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None  # type: ignore[assignment]
+
+from kepler.models.experiment import Experiment, ExperimentList, ExperimentStatus
+from kepler.models.log import BaseLog
+
+# In-memory copy of the most recently loaded or saved experiment list. It is
+# keyed by the index path plus the (mtime, size) of the index and of every log
+# file, so that repeated loads only re-parse the files that changed
+_CACHE: Dict[str, Any] = {
+    "path": None,
+    "mtime": None,
+    "index": None,
+    "logs": {},
+    "list": None,
+}
+
+# Serializes registry reads and writes between the caller and background writers
+_LOCK = threading.RLock()
+
+# Open log files, keyed by path, kept for the lifetime of a running experiment
+_LOG_FILES: Dict[Path, IO[bytes]] = {}
+
+# Serializer for a single log entry. Typed log subclasses repeat their values
+# in `data`, so entries are written as the base model with only the common
+# fields, which is also cheaper than serializing each subclass and filtering
+_LOG_ADAPTER = TypeAdapter(BaseLog)
 
-from kepler.models.experiment import ExperimentList
+# Validator for a whole log file's worth of entries
+_LOGS_ADAPTER = TypeAdapter(List[BaseLog])
 
+# Whether finished experiments are flushed to stable storage. Runs that don't
+# need crash durability, such as test suites, can skip it with KEPLER_SYNC=0
+_SYNC = os.environ.get("KEPLER_SYNC", "1") != "0"
 
+
+@functools.lru_cache(maxsize=1)
 def get_app_dir() -> Path:
     """
     Get the application directory for storing experiment data.
     Uses click's app directory functionality.
 
+    The directory is created on the first call and the path is reused after.
+
     Returns:
         Path to the application directory
     """
@@ -34,35 +83,277 @@ def get_experiments_file_path() -> Path:
     return get_app_dir() / "experiments.json"
 
 
+def get_experiment_logs_path(experiment_id: str) -> Path:
+    """
+    Get the path to an experiment's log file.
+
+    Args:
+        experiment_id: ID of the experiment
+
+    Returns:
+        Path to the experiment's `logs.jsonl` file
+    """
+    return get_app_dir() / "experiments" / experiment_id / "logs.jsonl"
+
+
+def append_logs(experiment: Experiment) -> None:
+    """
+    Append an experiment's unsaved log entries to its log file.
+
+    The file is kept open until `close_experiment_logs` is called. The first
+    save of a new run (rather than an experiment read from disk) starts a new
+    file.
+
+    Args:
+        experiment: The experiment whose new log entries should be written
+    """
+    with _LOCK:
+        new_logs = experiment.logs[experiment._persisted :]
+        if not new_logs:
+            return
+
+        file_path = get_experiment_dir(experiment.id) / "logs.jsonl"
+        f = _LOG_FILES.get(file_path)
+        if experiment._new_run:
+            # The first write of a new run replaces any log file left by an
+            # earlier run with the same ID, rather than appending to it.
+            # The file is truncated separately so that the handle kept for
+            # later writes is still in append mode, and never overwrites
+            # entries appended through other handles
+            if f is not None:
+                f.close()
+                f = None
+            open(file_path, "wb").close()
+            experiment._new_run = False
+        if f is None:
+            f = open(file_path, "ab", buffering=64 * 1024)
+            _LOG_FILES[file_path] = f
+
+        dump_json = _LOG_ADAPTER.dump_json
+        f.write(b"".join(dump_json(log) + b"\n" for log in new_logs))
+        f.flush()
+        experiment._persisted += len(new_logs)
+
+        # Our own writes shouldn't invalidate the cached copy of the experiment
+        cached = _CACHE["list"]
+        if cached is not None and cached.get(experiment.id) is experiment:
+            _CACHE["logs"][experiment.id] = _file_mtime(file_path)
+
+
+def close_experiment_logs(experiment_id: str) -> None:
+    """
+    Close an experiment's log file if it is open.
+
+    Args:
+        experiment_id: ID of the experiment
+    """
+    with _LOCK:
+        f = _LOG_FILES.pop(get_experiment_logs_path(experiment_id), None)
+        if f is not None:
+            f.close()
+
+
+def sync_experiment(experiment_id: str) -> None:
+    """
+    Flush an experiment's saved data to stable storage.
+
+    Individual saves don't fsync, so this is called once when an experiment
+    finishes. It syncs the experiment's open log file and the directories the
+    index was renamed into and the log file was created in.
+
+    Args:
+        experiment_id: ID of the experiment
+    """
+    with _LOCK:
+        f = _LOG_FILES.get(get_experiment_logs_path(experiment_id))
+        if f is not None:
+            sync_file(f)
+
+        _fsync_dir(get_app_dir())
+        _fsync_dir(get_experiment_dir(experiment_id))
+
+
+def sync_file(f: IO[Any]) -> None:
+    """
+    Flush an open file to stable storage.
+
+    Only Python's buffer is flushed when syncing is disabled with KEPLER_SYNC=0.
+
+    Args:
+        f: The open file
+    """
+    f.flush()
+    if _SYNC:
+        os.fsync(f.fileno())
+
+
+def _fsync_dir(dir_path: Path) -> None:
+    """
+    Flush a directory's entries (e.g. renames) to stable storage.
+
+    This is a no-op on platforms that can't open directories, and when syncing
+    is disabled with KEPLER_SYNC=0.
+
+    Args:
+        dir_path: Path to the directory
+    """
+    if not _SYNC or not hasattr(os, "O_DIRECTORY"):
+        return
+    fd = os.open(dir_path, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
 def save_experiments(experiment_list: ExperimentList) -> None:
     """
     Save the experiment list to disk.
 
+    Only log entries that have not been saved yet are written, and the index
+    file is only rewritten when experiments were added, renamed or removed, or
+    changed status.
+    The index is replaced atomically but not fsynced; see `sync_experiment`.
+
     Args:
         experiment_list: The experiment list to save
     """
     file_path = get_experiments_file_path()
-    with open(file_path, "w") as f:
-        f.write(experiment_list.model_dump_json(indent=2))
+    with _LOCK:
+        for exp in experiment_list.experiments.values():
+            append_logs(exp)
+
+        index = to_json(
+            {
+                "experiments": {
+                    exp_id: {"id": exp.id, "name": exp.name, "status": exp.status}
+                    for exp_id, exp in experiment_list.experiments.items()
+                }
+            },
+            indent=2,
+        )
 
+        mtime = _file_mtime(file_path)
+        unchanged = (
+            _CACHE["path"] == file_path
+            and _CACHE["index"] == index
+            and _CACHE["mtime"] == mtime
+        )
+        if not unchanged:
+            # Write to a temporary file and rename it into place so that
+            # readers in other processes never see a partially written index
+            tmp_path = file_path.with_name(f"{file_path.name}.{os.getpid()}.tmp")
+            try:
+                with open(tmp_path, "wb") as f:
+                    f.write(index)
+                os.replace(tmp_path, file_path)
+            except BaseException:
+                # Don't leave a stray temporary file behind if the write fails
+                with contextlib.suppress(FileNotFoundError):
+                    os.unlink(tmp_path)
+                raise
+            mtime = _file_mtime(file_path)
 
-def load_experiments() -> ExperimentList:
+        log_mtimes = {
+            exp_id: _log_mtime(exp_id) for exp_id in experiment_list.experiments
+        }
+        _CACHE.update(
+            path=file_path,
+            mtime=mtime,
+            index=index,
+            logs=log_mtimes,
+            list=experiment_list,
+        )
+
+
+def save_experiment(experiment: Experiment) -> None:
     """
-    Load the experiment list from disk.
+    Add or update a single experiment in the saved experiment list.
+
+    This is safe to call from several processes sharing the same registry.
+
+    Args:
+        experiment: The experiment to save
+    """
+    with _registry_lock():
+        # Always re-read the index so entries added by other processes are
+        # kept, even if they were written within the same mtime tick
+        _CACHE["mtime"] = None
+
+        # Read the index strictly; saving a list loaded from an unreadable
+        # index would drop every experiment in it
+        experiment_list = _read_experiments()
+        experiment_list.add(experiment)
+        save_experiments(experiment_list)
+
+
+def remove_experiment(experiment_id: str) -> bool:
+    """
+    Remove a single experiment from the saved experiment list.
+
+    This is safe to call from several processes sharing the same registry.
+    The experiment's directory is left in place.
+
+    Args:
+        experiment_id: ID of the experiment to remove
 
     Returns:
-        The loaded experiment list, or a new one if the file doesn't exist
+        True if the experiment was removed, False if it wasn't saved
     """
-    file_path = get_experiments_file_path()
+    with _registry_lock():
+        # Re-read the index for the same reasons as `save_experiment`
+        _CACHE["mtime"] = None
 
-    if not file_path.exists():
-        return ExperimentList()
+        experiment_list = _read_experiments()
+        if experiment_list.get(experiment_id) is None:
+            return False
+
+        experiment_list.remove(experiment_id)
+        save_experiments(experiment_list)
+        return True
+
+
+@contextlib.contextmanager
+def _registry_lock() -> Generator[None, None, None]:
+    """
+    Hold an exclusive lock on the registry across threads and processes.
+
+    Yields:
+        None, while the lock is held
+    """
+    with _LOCK:
+        if fcntl is None:
+            yield
+            return
+
+        with open(get_app_dir() / "experiments.lock", "w") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
 
+
+def load_experiments(status: Optional[ExperimentStatus] = None) -> ExperimentList:
+    """
+    Load the experiment list from disk.
+
+    The list is served from memory when no file has changed since it was last
+    loaded or saved, so callers share (and may mutate) the same instance.
+    Otherwise only the log files that changed are re-read.
+
+    Args:
+        status: If given, only load experiments with this status. Experiments
+            are selected by the status recorded in the index, so only their
+            log files are read; the result is a new list that isn't cached.
+
+    Returns:
+        The loaded experiment list, or a new one if the file doesn't exist or
+        can't be read
+    """
     try:
-        with open(file_path, "r") as f:
-            data = json.load(f)
-        return ExperimentList.model_validate(data)
-    except (json.JSONDecodeError, ValueError) as e:
+        return _read_experiments(status)
+    except (ValueError, KeyError) as e:
         # Handle corrupted file
         # In a real application, we might want to create a backup
         # of the corrupted file before creating a new one
@@ -70,6 +361,235 @@ def load_experiments() -> ExperimentList:
         return ExperimentList()
 
 
+def _read_experiments(status: Optional[ExperimentStatus] = None) -> ExperimentList:
+    """
+    Load the experiment list from disk, raising if the index can't be read.
+
+    Callers that save the list back must use this rather than
+    `load_experiments`, so that an unreadable index is never replaced by one
+    built from an empty list.
+
+    Args:
+        status: If given, only load experiments with this status
+
+    Returns:
+        The loaded experiment list, or a new one if the file doesn't exist
+
+    Raises:
+        ValueError: If the index file is malformed
+    """
+    file_path = get_experiments_file_path()
+
+    with _LOCK:
+        mtime = _file_mtime(file_path)
+        if mtime is None:
+            return ExperimentList()
+
+        cached: Optional[ExperimentList] = None
+        if _CACHE["path"] == file_path:
+            cached = _CACHE["list"]
+
+        if cached is not None and _CACHE["mtime"] == mtime:
+            # The index is unchanged, so only log files need checking
+            log_mtimes = {
+                exp_id: _log_mtime(exp_id) for exp_id in cached.experiments
+            }
+            if _CACHE["logs"] == log_mtimes:
+                if status is not None:
+                    return cached.filter(status=status)
+                return cached
+            index = _CACHE["index"]
+        else:
+            with open(file_path, "rb") as f:
+                index = f.read()
+
+        entries = _parse_index(index)
+        if status is not None:
+            return _load_with_status(entries, status, cached)
+        log_mtimes = {exp_id: _log_mtime(exp_id) for exp_id in entries}
+
+        experiments = {}
+        for exp_id, entry in entries.items():
+            exp = cached.get(exp_id) if cached is not None else None
+            if exp is None or _CACHE["logs"].get(exp_id) != log_mtimes[exp_id]:
+                exp = _load_experiment(exp_id, entry)
+            experiments[exp_id] = exp
+        experiment_list = ExperimentList(experiments=experiments)
+
+        _CACHE.update(
+            path=file_path,
+            mtime=mtime,
+            index=index,
+            logs=log_mtimes,
+            list=experiment_list,
+        )
+        return experiment_list
+
+
+def _parse_index(index: bytes) -> Dict[str, Dict[str, Any]]:
+    """
+    Parse the experiment entries of an index file.
+
+    Args:
+        index: Contents of the index file
+
+    Returns:
+        The experiment entries, keyed by experiment ID
+
+    Raises:
+        ValueError: If the index isn't a JSON object mapping experiment IDs
+            to entry objects
+    """
+    parsed = from_json(index)
+    entries = parsed.get("experiments") if isinstance(parsed, dict) else None
+    if not isinstance(entries, dict) or not all(
+        isinstance(entry, dict) for entry in entries.values()
+    ):
+        raise ValueError("experiments file doesn't map IDs to experiment entries")
+    return entries
+
+
+def _load_with_status(
+    entries: Dict[str, Dict[str, Any]],
+    status: ExperimentStatus,
+    cached: Optional[ExperimentList],
+) -> ExperimentList:
+    """
+    Load the experiments whose index entry records the given status.
+
+    Entries without a recorded status (older registries) are loaded too, and
+    every result is checked against its logs in case the index is stale.
+
+    Args:
+        entries: The experiment entries from the index file
+        status: The status to select
+        cached: The cached experiment list, whose unchanged experiments are reused
+
+    Returns:
+        A new list of the matching experiments
+    """
+    experiment_list = ExperimentList()
+    for exp_id, entry in entries.items():
+        if entry.get("status", status.value) != status.value:
+            continue
+
+        exp = cached.get(exp_id) if cached is not None else None
+        if exp is None or _CACHE["logs"].get(exp_id) != _log_mtime(exp_id):
+            exp = _load_experiment(exp_id, entry)
+        if exp.status == status:
+            experiment_list.add(exp)
+    return experiment_list
+
+
+def _load_experiment(experiment_id: str, entry: Dict[str, Any]) -> Experiment:
+    """
+    Load a single experiment from its index entry and log file.
+
+    Args:
+        experiment_id: ID of the experiment
+        entry: The experiment's entry in the index file
+
+    Returns:
+        The loaded experiment
+    """
+    # Registries written before logs moved to `logs.jsonl` embed them inline;
+    # those are treated as unsaved so the next save migrates them
+    if "logs" in entry:
+        exp = Experiment.model_validate(entry)
+        exp._new_run = False
+        return exp
+
+    try:
+        with open(get_experiment_logs_path(experiment_id), "rb") as f:
+            data = f.read()
+    except FileNotFoundError:
+        data = b""
+
+    # Drop a partially written trailing line, then validate every entry in a
+    # single call by presenting the lines as one JSON array
+    lines = data[: data.rfind(b"\n") + 1].splitlines()
+    try:
+        logs = _LOGS_ADAPTER.validate_json(b"[" + b",".join(filter(None, lines)) + b"]")
+    except ValueError:
+        # Validate line by line instead, so that a malformed entry only costs
+        # that entry rather than the experiment or the whole registry
+        logs = _validate_log_lines(experiment_id, lines)
+
+    # The logs were just validated, so skip re-validating them as a field.
+    # An empty log file still goes through __init__ to get its start entry,
+    # but that entry only exists in memory and is never written back
+    name = entry.get("name", experiment_id)
+    if logs:
+        exp = Experiment.model_construct(id=experiment_id, name=name, logs=logs)
+    else:
+        exp = Experiment(id=experiment_id, name=name, logs=logs)
+    exp._persisted = len(exp.logs)
+    exp._new_run = False
+    return exp
+
+
+def _validate_log_lines(experiment_id: str, lines: List[bytes]) -> List[BaseLog]:
+    """
+    Validate log file lines one at a time, skipping malformed entries.
+
+    Args:
+        experiment_id: ID of the experiment the lines belong to
+        lines: The lines of the experiment's log file
+
+    Returns:
+        The log entries of the lines that could be validated
+    """
+    logs = []
+    for number, line in enumerate(lines, 1):
+        if not line:
+            continue
+        try:
+            logs.append(_LOG_ADAPTER.validate_json(line))
+        except ValueError as e:
+            click.echo(
+                f"Skipping malformed log entry {number} of experiment "
+                f"{experiment_id}: {e}",
+                err=True,
+            )
+    return logs
+
+
+def _clear_cache() -> None:
+    """Forget the cached experiment list, so the next load reads every file."""
+    with _LOCK:
+        _CACHE.update(path=None, mtime=None, index=None, logs={}, list=None)
+
+
+def _file_mtime(file_path: Path) -> Optional[Tuple[int, int]]:
+    """
+    Get the modification signature of a file.
+
+    Args:
+        file_path: Path to the file
+
+    Returns:
+        The file's (mtime in nanoseconds, size) pair, or None if it doesn't exist
+    """
+    try:
+        stat = os.stat(file_path)
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _log_mtime(experiment_id: str) -> Optional[Tuple[int, int]]:
+    """
+    Get the modification signature of an experiment's log file.
+
+    Args:
+        experiment_id: ID of the experiment
+
+    Returns:
+        The log file's (mtime in nanoseconds, size) pair, or None if it doesn't exist
+    """
+    return _file_mtime(get_experiment_logs_path(experiment_id))
+
+
 def get_experiment_dir(experiment_id: str) -> Path:
     """
     Get the directory for storing experiment artifacts.
@@ -80,6 +600,36 @@ def get_experiment_dir(experiment_id: str) -> Path:
     Returns:
         Path to the experiment directory
     """
-    exp_dir = get_app_dir() / "experiments" / experiment_id
+    return _make_experiment_dir(get_app_dir(), experiment_id)
+
+
+@functools.lru_cache(maxsize=1024)
+def _make_experiment_dir(app_dir: Path, experiment_id: str) -> Path:
+    """
+    Create an experiment directory, once per application directory and ID.
+
+    Args:
+        app_dir: The application directory
+        experiment_id: ID of the experiment
+
+    Returns:
+        Path to the experiment directory
+    """
+    exp_dir = app_dir / "experiments" / experiment_id
     os.makedirs(exp_dir, exist_ok=True)
     return exp_dir
+
+
+def delete_experiment_dir(experiment_id: str) -> None:
+    """
+    Delete the directory of an experiment and everything in it.
+
+    Args:
+        experiment_id: ID of the experiment
+    """
+    exp_dir = get_app_dir() / "experiments" / experiment_id
+    if exp_dir.exists():
+        shutil.rmtree(exp_dir)
+
+    # The directory may be recreated later, so forget that it exists
+    _make_experiment_dir.cache_clear()
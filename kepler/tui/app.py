@@ -2,7 +2,10 @@
 Terminal UI for experiment management.
 """
 
-from pathlib import Path
+import os
+import threading
+from typing import Dict, Optional, Tuple
+
 from textual.app import App
 from textual.widgets import Footer, Header
 from textual.widgets import ContentSwitcher, Static
@@ -10,6 +13,7 @@ from watchdog.events import FileSystemEventHandler
 from watchdog.observers import Observer
 
 from kepler.models import (
+    ExperimentStatus,
     get_experiments_file_path,
     load_experiments,
 )
@@ -18,17 +22,45 @@ from kepler.models import (
 class ExperimentFileHandler(FileSystemEventHandler):
     """
     File system event handler for experiment file changes.
+
+    Writes tend to arrive in bursts, so the callback is only run once no
+    further change has been seen for `delay` seconds.
     """
 
-    def __init__(self, callback):
+    def __init__(self, callback, delay: float = 0.1):
         self.callback = callback
+        self.delay = delay
+        self.experiments_file = str(get_experiments_file_path())
+        self._timer = None
+        self._lock = threading.Lock()
 
     def on_modified(self, event):
-        if (
-            not event.is_directory
-            and Path(event.src_path) == get_experiments_file_path()
-        ):
-            self.callback()
+        if not event.is_directory:
+            # Compare the raw event path, since this runs for every write
+            path = event.src_path
+            if path == self.experiments_file or os.path.basename(path) == "logs.jsonl":
+                self._schedule()
+
+    def on_moved(self, event):
+        # The index is replaced by renaming a temporary file over it
+        if not event.is_directory and event.dest_path == self.experiments_file:
+            self._schedule()
+
+    def _schedule(self):
+        """Run the callback after the delay, restarting any pending wait."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(self.delay, self.callback)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def cancel(self):
+        """Cancel a pending callback."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
 
 
 class ExperimentMonitor:
@@ -44,13 +76,15 @@ class ExperimentMonitor:
 
     def start(self):
         """Start monitoring for changes."""
-        self.observer.schedule(self.handler, self.path, recursive=False)
+        # Recursive so that appends to per-experiment log files are seen too
+        self.observer.schedule(self.handler, self.path, recursive=True)
         self.observer.start()
 
     def stop(self):
         """Stop monitoring for changes."""
         self.observer.stop()
         self.observer.join()
+        self.handler.cancel()
 
 
 class ExperimentTUI(App):
@@ -58,25 +92,37 @@ class ExperimentTUI(App):
     Terminal UI for experiment management.
     """
 
-    def __init__(self, *args, **kwargs):
-        """Initialize the application."""
+    def __init__(self, *args, watch_mode: bool = True, **kwargs):
+        """
+        Initialize the application.
+
+        Args:
+            watch_mode: Whether to refresh automatically when experiment
+                files change. When disabled, no file monitor is started and
+                the view only updates on an explicit refresh.
+        """
         super().__init__(*args, **kwargs)
 
-        # Create a monitor for experiment file changes
-        self.monitor = ExperimentMonitor(self.refresh_experiments)
+        # The file monitor is only created once the app is mounted
+        self.watch_mode = watch_mode
+        self.monitor: Optional[ExperimentMonitor] = None
 
         # Load initial experiments
-        self.experiments = load_experiments()
+        self._load_experiments()
 
         # Filter state
         self.show_running_only = False
 
         # Currently selected experiment for logs view
-        self.selected_experiment_id = None
+        self.selected_experiment_id: Optional[str] = None
 
         # Current view (experiments or logs)
         self.current_view = "experiments"
 
+        # Formatted rows of finished experiments, keyed by ID, name and log
+        # count, so that unchanged rows aren't re-formatted on every refresh
+        self._row_cache: Dict[Tuple[str, str, int], str] = {}
+
     def on_mount(self) -> None:
         """Mount the application."""
         # Set up the UI
@@ -86,17 +132,24 @@ class ExperimentTUI(App):
         self.bind("b", "back_to_experiments")
         self.bind("l", "toggle_logs_view")
 
-        # Start the monitor
-        self.monitor.start()
+        # Start monitoring for experiment file changes
+        if self.watch_mode:
+            self.monitor = ExperimentMonitor(self.refresh_experiments)
+            self.monitor.start()
 
         # Render the experiments
         self.render_experiments()
 
     def compose(self):
         """Compose the application."""
-        # Create the UI components
+        # Create the UI components. Both views are created once and updated
+        # in place on each render
         yield Header()
-        self.content = ContentSwitcher(id="content")
+        self.experiments_view = Static("", id="experiments")
+        self.logs_view = Static("", id="logs")
+        self.content = ContentSwitcher(
+            self.experiments_view, self.logs_view, id="content", initial="experiments"
+        )
         yield self.content
         yield Footer()
 
@@ -129,9 +182,17 @@ class ExperimentTUI(App):
 
     # We're now using keyboard shortcuts instead of buttons
 
+    def _load_experiments(self) -> None:
+        """Load the experiments and count them by status."""
+        self.experiments = load_experiments()
+
+        # The counts only change when the experiments are reloaded, so
+        # compute them once here rather than on every render
+        self._status_counts = self.experiments.status_counts()
+
     def refresh_experiments(self) -> None:
         """Refresh the experiments from disk."""
-        self.experiments = load_experiments()
+        self._load_experiments()
         if self.current_view == "experiments":
             self.render_experiments()
         elif self.current_view == "logs" and self.selected_experiment_id:
@@ -160,43 +221,34 @@ class ExperimentTUI(App):
         experiments = filtered_experiments.sort_by("start_time", reverse=True)
 
         # Add rows for each experiment
+        row_cache: Dict[Tuple[str, str, int], str] = {}
         for exp in experiments:
-            # Format duration
-            duration = exp.duration
-            if duration is not None:
-                if duration < 60:
-                    duration_str = f"{duration:.1f}s"
-                elif duration < 3600:
-                    duration_str = f"{duration / 60:.1f}m"
-                else:
-                    duration_str = f"{duration / 3600:.1f}h"
-            else:
-                duration_str = "N/A"
-
-            # Format status
-            status_str = str(exp.status)
-
-            # Format tags
-            tags_str = ", ".join(exp.tags) if exp.tags else ""
+            key = (exp.id, exp.name, len(exp.logs))
+            row = self._row_cache.get(key)
+            if row is None:
+                row = self._format_row(exp)
 
-            # Format the row
-            lines.append(
-                f"{exp.id:<24} {exp.name:<20} {status_str:<20} {exp.start_time.strftime('%Y-%m-%d %H:%M:%S'):<20} {duration_str:<10} {tags_str}"
-            )
+            # Running experiments' durations keep growing, so only cache
+            # the rows of experiments that have finished
+            if exp.end_time is not None:
+                row_cache[key] = row
+            lines.append(row)
 
             # Add a line to indicate how to view logs
             lines.append("  Press L to view logs (select experiment first)")
             lines.append("")
 
+        self._row_cache = row_cache
+
         # Add summary information
         lines.extend(
             [
                 "",
                 "Summary:",
                 f"Total: {self.experiments.count}",
-                f"Running: {self.experiments.running.count}",
-                f"Completed: {self.experiments.completed.count}",
-                f"Failed: {self.experiments.failed.count}",
+                f"Running: {self._status_counts[ExperimentStatus.RUNNING]}",
+                f"Completed: {self._status_counts[ExperimentStatus.COMPLETED]}",
+                f"Failed: {self._status_counts[ExperimentStatus.ERROR]}",
                 "",
                 "Press F to toggle filter",
                 "Press L to view logs of selected experiment",
@@ -205,20 +257,40 @@ class ExperimentTUI(App):
             ]
         )
 
-        # Create a new content widget
-        content = Static("\n".join(lines), id="experiments")
-
         # Update the content
-        if "experiments" in self.content.children:
-            self.content.remove_child(self.content.get_child_by_id("experiments"))
-
-        self.content.mount(content)
+        self.experiments_view.update("\n".join(lines))
         self.content.current = "experiments"
 
         # Set the first experiment as selected if none is selected
         if not self.selected_experiment_id and experiments:
             self.selected_experiment_id = experiments[0].id
 
+    def _format_row(self, exp) -> str:
+        """Format the row for an experiment in the experiments view."""
+        # Format duration
+        duration = exp.duration
+        if duration is not None:
+            if duration < 60:
+                duration_str = "%.1fs" % duration
+            elif duration < 3600:
+                duration_str = "%.1fm" % (duration / 60)
+            else:
+                duration_str = "%.1fh" % (duration / 3600)
+        else:
+            duration_str = "N/A"
+
+        # Format tags
+        tags_str = ", ".join(exp.tags)
+
+        return "%-24s %-20s %-20s %-20s %-10s %s" % (
+            exp.id,
+            exp.name,
+            exp.status,
+            exp.start_time.strftime("%Y-%m-%d %H:%M:%S"),
+            duration_str,
+            tags_str,
+        )
+
     def render_logs(self, experiment_id: str) -> None:
         """Render the logs for a specific experiment."""
         # Get the experiment
@@ -240,7 +312,7 @@ class ExperimentTUI(App):
         for log in exp.logs:
             # Format the row
             lines.append(
-                f"{log.timestamp.strftime('%Y-%m-%d %H:%M:%S')}  {log.type.value:<10} {log.message}"
+                f"{log.timestamp_str}  {log.type.value:<10} {log.message}"
             )
 
             # Add data details if present
@@ -258,25 +330,28 @@ class ExperimentTUI(App):
             ]
         )
 
-        # Create a new content widget
-        content = Static("\n".join(lines), id="logs")
-
         # Update the content
-        if "logs" in self.content.children:
-            self.content.remove_child(self.content.get_child_by_id("logs"))
-        self.content.mount(content)
+        self.logs_view.update("\n".join(lines))
         self.content.current = "logs"
 
     async def action_quit(self) -> None:
         """Quit the application."""
         # Stop the monitor
-        self.monitor.stop()
+        if self.monitor is not None:
+            self.monitor.stop()
+            self.monitor = None
 
         # Exit the application
         self.exit()
 
 
-def run_tui():
-    """Run the terminal UI."""
-    app = ExperimentTUI()
+def run_tui(watch_mode: bool = True):
+    """
+    Run the terminal UI.
+
+    Args:
+        watch_mode: Whether to refresh automatically when experiment files
+            change.
+    """
+    app = ExperimentTUI(watch_mode=watch_mode)
     app.run()
@@ -0,0 +1,7 @@
+"""
+Shared test configuration.
+"""
+import os
+
+# Test runs don't need crash durability, so skip fsync in the storage layer
+os.environ.setdefault("KEPLER_SYNC", "0")